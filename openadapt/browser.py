@@ -1,13 +1,13 @@
 """Utilities for working with BrowserEvents."""
 
 from statistics import mean, median, stdev
-import json
 
 from bs4 import BeautifulSoup
 from dtaidistance import dtw, dtw_ndim
 from sqlalchemy.orm import Session as SaSession
 from tqdm import tqdm
 import numpy as np
+import orjson
 import websockets.sync.server
 
 from openadapt import models, utils
@@ -97,7 +97,7 @@ def set_browser_mode(
     logger.info(f"{type(websocket)=}")
     VALID_MODES = ("idle", "record", "replay")
     assert mode in VALID_MODES, f"{mode=} not in {VALID_MODES=}"
-    message = json.dumps({"type": "SET_MODE", "mode": mode})
+    message = orjson.dumps({"type": "SET_MODE", "mode": mode}).decode("utf-8")
     logger.info(f"sending {message=}")
     websocket.send(message)
 
@@ -3,15 +3,17 @@
 Module: crud.py
 """
 
-from typing import Any, TypeVar
-import asyncio
-import json
-import os
+from contextvars import ContextVar
+from typing import Any, Generator, TypeVar
+import concurrent.futures
+import sys
 import time
 
+from PIL import Image
 from sqlalchemy.orm import Session as SaSession
-from sqlalchemy.orm import joinedload, subqueryload
-import psutil
+from sqlalchemy.orm import joinedload, load_only, subqueryload
+import numpy as np
+import orjson
 import sqlalchemy as sa
 
 from openadapt import utils
@@ -32,16 +34,52 @@ from openadapt.models import (
 )
 from openadapt.privacy.base import ScrubbingProvider
 
-BATCH_SIZE = 1
+BATCH_SIZE = 1000
 
-lock = asyncio.Event()
-lock.set()
-action_events = []
-screenshots = []
-window_events = []
-browser_events = []
-performance_stats = []
-memory_stats = []
+# per-context insert buffers keyed by table, so concurrent recorders each
+# own their flush state instead of sharing module-level lists
+_buffers: ContextVar[dict[Any, list[dict[str, Any]]]] = ContextVar("_buffers")
+
+
+def _get_buffer(table: sa.Table) -> list[dict[str, Any]]:
+    """Get the insert buffer for the given table in the current context.
+
+    Args:
+        table (sa.Table): The SQLAlchemy table.
+
+    Returns:
+        list: The buffer of pending rows for the table.
+    """
+    try:
+        buffers = _buffers.get()
+    except LookupError:
+        buffers = {}
+        _buffers.set(buffers)
+    return buffers.setdefault(table, [])
+
+
+# row template per table (all columns mapped to None), computed once and
+# copied instead of rebuilt on every _insert call
+_row_templates: dict[Any, dict[str, Any]] = {}
+
+# Insert constructs per table, built once instead of on every _insert call
+_insert_stmt_by_table: dict[Any, sa.sql.Insert] = {}
+
+
+def _get_insert_stmt(table: sa.Table) -> sa.sql.Insert:
+    """Get a cached Insert construct for the given table.
+
+    Args:
+        table (sa.Table): The SQLAlchemy table.
+
+    Returns:
+        sa.sql.Insert: The (cached) Insert construct.
+    """
+    stmt = _insert_stmt_by_table.get(table)
+    if stmt is None:
+        stmt = sa.insert(table)
+        _insert_stmt_by_table[table] = stmt
+    return stmt
 
 
 def _insert(
@@ -63,12 +101,14 @@ def _insert(
         sa.engine.Result | None: The SQLAlchemy Result object if a buffer is
           not provided. None if a buffer is provided.
     """
-    db_obj = {column.name: None for column in table.__table__.columns}
-    for key in db_obj:
-        if key in event_data:
-            val = event_data[key]
-            db_obj[key] = val
-            del event_data[key]
+    template = _row_templates.get(table)
+    if template is None:
+        template = {column.name: None for column in table.__table__.columns}
+        _row_templates[table] = template
+
+    db_obj = template.copy()
+    for key in event_data.keys() & template.keys():
+        db_obj[key] = event_data.pop(key)
 
     # make sure all event data was saved
     assert not event_data, event_data
@@ -78,7 +118,7 @@ def _insert(
 
     if buffer is None or len(buffer) >= BATCH_SIZE:
         to_insert = buffer or [db_obj]
-        result = session.execute(sa.insert(table), to_insert)
+        result = session.execute(_get_insert_stmt(table), to_insert)
         session.commit()
         if buffer:
             buffer.clear()
@@ -86,6 +126,26 @@ def _insert(
         return result
 
 
+def flush_buffers(session: SaSession) -> None:
+    """Flush any buffered events to the database in a single transaction.
+
+    Args:
+        session (sa.orm.Session): The database session.
+    """
+    try:
+        buffers = _buffers.get()
+    except LookupError:
+        return
+    flushed = False
+    for table, buffer in buffers.items():
+        if buffer:
+            session.execute(_get_insert_stmt(table), buffer)
+            buffer.clear()
+            flushed = True
+    if flushed:
+        session.commit()
+
+
 def insert_action_event(
     session: SaSession,
     recording: Recording,
@@ -106,7 +166,7 @@ def insert_action_event(
         "recording_id": recording.id,
         "recording_timestamp": recording.timestamp,
     }
-    _insert(session, event_data, ActionEvent, action_events)
+    _insert(session, event_data, ActionEvent, _get_buffer(ActionEvent))
 
 
 def insert_screenshot(
@@ -129,7 +189,7 @@ def insert_screenshot(
         "recording_id": recording.id,
         "recording_timestamp": recording.timestamp,
     }
-    _insert(session, event_data, Screenshot, screenshots)
+    _insert(session, event_data, Screenshot, _get_buffer(Screenshot))
 
 
 def insert_window_event(
@@ -152,7 +212,7 @@ def insert_window_event(
         "recording_id": recording.id,
         "recording_timestamp": recording.timestamp,
     }
-    _insert(session, event_data, WindowEvent, window_events)
+    _insert(session, event_data, WindowEvent, _get_buffer(WindowEvent))
 
 
 def insert_browser_event(
@@ -175,7 +235,7 @@ def insert_browser_event(
         "recording_id": recording.id,
         "recording_timestamp": recording.timestamp,
     }
-    _insert(session, event_data, BrowserEvent, browser_events)
+    _insert(session, event_data, BrowserEvent, _get_buffer(BrowserEvent))
 
 
 def insert_perf_stat(
@@ -201,7 +261,7 @@ def insert_perf_stat(
         "start_time": start_time,
         "end_time": end_time,
     }
-    _insert(session, event_perf_stat, PerformanceStat, performance_stats)
+    _insert(session, event_perf_stat, PerformanceStat, _get_buffer(PerformanceStat))
 
 
 def get_perf_stats(
@@ -218,9 +278,12 @@ def get_perf_stats(
         list[PerformanceStat]: A list of performance stats for the recording.
     """
     return (
-        session.query(PerformanceStat)
-        .filter(PerformanceStat.recording_id == recording.id)
-        .order_by(PerformanceStat.start_time)
+        session.execute(
+            sa.select(PerformanceStat)
+            .where(PerformanceStat.recording_id == recording.id)
+            .order_by(PerformanceStat.start_time)
+        )
+        .scalars()
         .all()
     )
 
@@ -245,7 +308,7 @@ def insert_memory_stat(
         "memory_usage_bytes": memory_usage_bytes,
         "timestamp": timestamp,
     }
-    _insert(session, memory_stat, MemoryStat, memory_stats)
+    _insert(session, memory_stat, MemoryStat, _get_buffer(MemoryStat))
 
 
 def get_memory_stats(
@@ -263,9 +326,12 @@ def get_memory_stats(
 
     """
     return (
-        session.query(MemoryStat)
-        .filter(MemoryStat.recording_id == recording.id)
-        .order_by(MemoryStat.timestamp)
+        session.execute(
+            sa.select(MemoryStat)
+            .where(MemoryStat.recording_id == recording.id)
+            .order_by(MemoryStat.timestamp)
+        )
+        .scalars()
         .all()
     )
 
@@ -280,10 +346,13 @@ def insert_recording(session: SaSession, recording_data: dict) -> Recording:
     Returns:
         Recording: The recording object.
     """
-    db_obj = Recording(**recording_data)
-    session.add(db_obj)
+    # INSERT ... RETURNING writes and re-fetches server-assigned columns in
+    # one round trip, instead of a commit followed by a refresh SELECT
+    result = session.execute(
+        sa.insert(Recording).returning(Recording), [recording_data]
+    )
+    db_obj = result.scalar_one()
     session.commit()
-    session.refresh(db_obj)
     return db_obj
 
 
@@ -295,7 +364,29 @@ def delete_recording(session: SaSession, recording: Recording) -> None:
         recording (Recording): The recording object.
     """
     recording_timestamp = recording.timestamp
-    session.query(Recording).filter(Recording.id == recording.id).delete()
+    # delete server-side with Core statements rather than loading rows into
+    # the ORM; SQLite does not enforce the ON DELETE CASCADE declarations,
+    # so fan out to the child tables explicitly
+    for table in (
+        ActionEvent,
+        Screenshot,
+        WindowEvent,
+        BrowserEvent,
+        PerformanceStat,
+        MemoryStat,
+        AudioInfo,
+        ScrubbedRecording,
+    ):
+        session.execute(
+            sa.delete(table)
+            .where(table.recording_id == recording.id)
+            .execution_options(synchronize_session=False)
+        )
+    session.execute(
+        sa.delete(Recording)
+        .where(Recording.id == recording.id)
+        .execution_options(synchronize_session=False)
+    )
     session.commit()
 
     utils.delete_performance_plot(recording_timestamp)
@@ -322,6 +413,52 @@ def get_all_recordings(session: SaSession) -> list[Recording]:
     )
 
 
+def stream_recordings(
+    session: SaSession,
+    chunk: int = 100,
+) -> Generator[Recording, None, None]:
+    """Iterate over all original recordings without materializing them at once.
+
+    Args:
+        session (sa.orm.Session): The database session.
+        chunk (int): Number of recordings to buffer per fetch.
+
+    Yields:
+        Recording: The original recordings, newest first.
+    """
+    yield from (
+        session.query(Recording)
+        .filter(Recording.original_recording_id == None)  # noqa: E711
+        .order_by(sa.desc(Recording.timestamp))
+        .yield_per(chunk)
+    )
+
+
+def get_recordings_page(
+    session: SaSession,
+    offset: int,
+    limit: int,
+) -> list[Recording]:
+    """Get a page of original recordings, newest first.
+
+    Args:
+        session (sa.orm.Session): The database session.
+        offset (int): Number of recordings to skip.
+        limit (int): Maximum number of recordings to return.
+
+    Returns:
+        list[Recording]: The requested page of recordings.
+    """
+    return (
+        session.query(Recording)
+        .filter(Recording.original_recording_id == None)  # noqa: E711
+        .order_by(sa.desc(Recording.timestamp))
+        .limit(limit)
+        .offset(offset)
+        .all()
+    )
+
+
 def get_all_scrubbed_recordings(
     session: SaSession,
 ) -> list[ScrubbedRecording]:
@@ -398,9 +535,12 @@ def _get(
           ordered by timestamp.
     """
     return (
-        session.query(table)
-        .filter(table.recording_id == recording_id)
-        .order_by(table.timestamp)
+        session.execute(
+            sa.select(table)
+            .where(table.recording_id == recording_id)
+            .order_by(table.timestamp)
+        )
+        .scalars()
         .all()
     )
 
@@ -475,34 +615,36 @@ def filter_stop_sequences(action_events: list[ActionEvent]) -> None:
             action_events.pop()
             return
 
+    # snapshot the attributes consulted below once per event; the scan
+    # otherwise repeats the same ORM attribute access for every stop sequence
+    events = [
+        (event.name, event.canonical_key_char, event.canonical_key_name)
+        for event in action_events
+    ]
+    stop_sequences = [tuple(sequence) for sequence in config.STOP_SEQUENCES]
+
     # create list of indices for sequence detection
     # one index for each stop sequence in STOP_SEQUENCES
     # start from the back of the sequence
-    stop_sequence_indices = [len(sequence) - 1 for sequence in config.STOP_SEQUENCES]
+    stop_sequence_indices = [len(sequence) - 1 for sequence in stop_sequences]
 
     # index of sequence to remove, -1 if none found
     sequence_to_remove = -1
     # number of events to remove
     num_to_remove = 0
 
-    for i in range(0, len(config.STOP_SEQUENCES)):
+    for i, sequence in enumerate(stop_sequences):
         # iterate backwards through list of action events
-        for j in range(len(action_events) - 1, -1, -1):
+        for j in range(len(events) - 1, -1, -1):
             # never go past 1st action event, so if a sequence is longer than
             # len(action_events), it can't have been in the recording
-            if (
-                action_events[j].canonical_key_char
-                == config.STOP_SEQUENCES[i][stop_sequence_indices[i]]
-                or action_events[j].canonical_key_name
-                == config.STOP_SEQUENCES[i][stop_sequence_indices[i]]
-            ) and action_events[j].name == "press":
+            name, key_char, key_name = events[j]
+            target = sequence[stop_sequence_indices[i]]
+            if (key_char == target or key_name == target) and name == "press":
                 # for press events, compare the characters
                 stop_sequence_indices[i] -= 1
                 num_to_remove += 1
-            elif action_events[j].name == "release" and (
-                action_events[j].canonical_key_char in config.STOP_SEQUENCES[i]
-                or action_events[j].canonical_key_name in config.STOP_SEQUENCES[i]
-            ):
+            elif name == "release" and (key_char in sequence or key_name in sequence):
                 # can consider any release event with any sequence char as
                 # part of the sequence
                 num_to_remove += 1
@@ -534,29 +676,135 @@ def save_screenshot_diff(
     Returns:
         list[Screenshot]: A list of screenshots with diff data saved to the db.
     """
-    data_updated = False
     logger.info("verifying diffs for screenshots...")
 
+    # compute diff and mask together in a single NumPy pass per pair of
+    # frames, reusing the previous frame's array so each image is decoded
+    # only once instead of twice (as .prev of one pair and current of the
+    # next)
+    to_encode = []
+    prev_arr = None
+    prev_timestamp = None
     for screenshot in screenshots:
         if not screenshot.prev:
+            prev_arr = None
+            prev_timestamp = None
             continue
+        if screenshot.png_diff_data and screenshot.png_diff_mask_data:
+            prev_arr = None
+            prev_timestamp = None
+            continue
+
+        if prev_arr is None or prev_timestamp != screenshot.prev.timestamp:
+            prev_arr = np.asarray(screenshot.prev.image, dtype=np.int16)
+        curr_arr = np.asarray(screenshot.image, dtype=np.int16)
+        diff_arr = np.abs(curr_arr - prev_arr).astype(np.uint8)
+
+        diff_image = None
+        mask_image = None
         if not screenshot.png_diff_data:
-            screenshot.png_diff_data = screenshot.convert_png_to_binary(screenshot.diff)
-            data_updated = True
+            diff_image = Image.fromarray(diff_arr)
         if not screenshot.png_diff_mask_data:
-            screenshot.png_diff_mask_data = screenshot.convert_png_to_binary(
-                screenshot.diff_mask
-            )
-            data_updated = True
+            mask_arr = diff_arr.any(axis=-1)
+            mask_image = Image.fromarray((mask_arr * 255).astype(np.uint8)).convert("1")
+        to_encode.append((screenshot, diff_image, mask_image))
+
+        prev_arr = curr_arr
+        prev_timestamp = screenshot.timestamp
+
+    if not to_encode:
+        return screenshots
+
+    def encode(
+        item: tuple[Screenshot, Image.Image | None, Image.Image | None],
+    ) -> dict[str, Any]:
+        """Encode the diff images of one screenshot to PNG update values."""
+        screenshot, diff_image, mask_image = item
+        update = {"id": screenshot.id}
+        if diff_image is not None:
+            update["png_diff_data"] = screenshot.convert_png_to_binary(diff_image)
+        if mask_image is not None:
+            update["png_diff_mask_data"] = screenshot.convert_png_to_binary(mask_image)
+        return update
+
+    # PNG encoding is CPU-bound zlib work during which Pillow releases the
+    # GIL, so threads give real parallelism without pickling image data
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        updates = list(executor.map(encode, to_encode))
+
+    logger.info("saving screenshot diff data to db...")
+    # one UPDATE executemany by primary key instead of a statement per object
+    session.execute(sa.update(Screenshot), updates)
+    session.commit()
 
-    if data_updated:
-        logger.info("saving screenshot diff data to db...")
-        session.bulk_save_objects(screenshots)
-        session.commit()
+    # reflect the persisted values on the in-memory objects without marking
+    # them dirty (which would trigger a second, per-row flush)
+    for (screenshot, _, _), update in zip(to_encode, updates):
+        for key, value in update.items():
+            sa.orm.attributes.set_committed_value(screenshot, key, value)
 
     return screenshots
 
 
+def iter_screenshots(
+    session: SaSession,
+    recording: Recording,
+    chunk: int = 64,
+) -> Generator[Screenshot, None, None]:
+    """Iterate over screenshots for a given recording in timestamp order.
+
+    Uses keyset pagination so only a small window of screenshots (and their
+    PNG blobs) is resident at a time, rather than the whole recording.
+    Each yielded screenshot has its ``prev`` attribute set to the previous
+    screenshot (or itself, for the first).
+
+    Args:
+        session (sa.orm.Session): The database session.
+        recording (Recording): The recording object.
+        chunk (int): Number of screenshots to fetch per query.
+
+    Yields:
+        Screenshot: The screenshots for the recording, in timestamp order.
+    """
+    last_timestamp = None
+    prev = None
+    while True:
+        stmt = (
+            sa.select(Screenshot)
+            .where(Screenshot.recording_id == recording.id)
+            .options(
+                # defer the diff blobs; they are only needed on the save_diff
+                # path and load on attribute access
+                load_only(
+                    Screenshot.id,
+                    Screenshot.recording_id,
+                    Screenshot.recording_timestamp,
+                    Screenshot.timestamp,
+                    Screenshot.png_data,
+                ),
+                subqueryload(Screenshot.action_event).subqueryload(
+                    ActionEvent.recording
+                ),
+                subqueryload(Screenshot.action_event).subqueryload(
+                    ActionEvent.screenshot
+                ),
+                subqueryload(Screenshot.recording),
+            )
+            .order_by(Screenshot.timestamp)
+            .limit(chunk)
+        )
+        if last_timestamp is not None:
+            stmt = stmt.where(Screenshot.timestamp > last_timestamp)
+        screenshots = session.execute(stmt).scalars().all()
+        if not screenshots:
+            return
+        for screenshot in screenshots:
+            screenshot.prev = prev if prev is not None else screenshot
+            prev = screenshot
+            yield screenshot
+        last_timestamp = screenshots[-1].timestamp
+
+
 def get_screenshots(
     session: SaSession,
     recording: Recording,
@@ -571,22 +819,7 @@ def get_screenshots(
     Returns:
         list[Screenshot]: A list of screenshots for the recording.
     """
-    screenshots = (
-        session.query(Screenshot)
-        .filter(Screenshot.recording_id == recording.id)
-        .options(
-            subqueryload(Screenshot.action_event).subqueryload(ActionEvent.recording),
-            subqueryload(Screenshot.action_event).subqueryload(ActionEvent.screenshot),
-            subqueryload(Screenshot.recording),
-        )
-        .order_by(Screenshot.timestamp)
-        .all()
-    )
-
-    for prev, cur in zip(screenshots, screenshots[1:]):
-        cur.prev = prev
-    if screenshots:
-        screenshots[0].prev = screenshots[0]
+    screenshots = list(iter_screenshots(session, recording))
 
     if save_diff:
         screenshots = save_screenshot_diff(session, screenshots)
@@ -639,6 +872,32 @@ def get_browser_events(session: SaSession, recording: Recording) -> list[Browser
     )
 
 
+def get_all_events(
+    session: SaSession,
+    recording: Recording,
+) -> tuple[list[ActionEvent], list[WindowEvent], list[BrowserEvent], list[Screenshot]]:
+    """Get all event types for a recording on a single session.
+
+    Issuing the queries back-to-back on one session keeps SQLite in a single
+    read transaction, instead of paying per-query transaction setup when
+    iterating over many recordings.
+
+    Args:
+        session (sa.orm.Session): The database session.
+        recording (Recording): The recording object.
+
+    Returns:
+        tuple: Action events, window events, browser events, and screenshots
+          for the recording.
+    """
+    return (
+        get_action_events(session, recording),
+        get_window_events(session, recording),
+        get_browser_events(session, recording),
+        get_screenshots(session, recording),
+    )
+
+
 def disable_action_event(session: SaSession, event_id: int) -> None:
     """Disable an action event.
 
@@ -754,7 +1013,7 @@ def insert_audio_info(
         recording_id=recording.id,
         timestamp=timestamp,
         sample_rate=sample_rate,
-        words_with_timestamps=json.dumps(word_list),
+        words_with_timestamps=orjson.dumps(word_list).decode("utf-8"),
     )
     session.add(audio_info)
     session.commit()
@@ -920,8 +1179,41 @@ def mark_scrubbing_complete(session: SaSession, scrubbed_recording_id: int) -> N
     session.commit()
 
 
+# file object holding the advisory lock; kept open for the process lifetime
+# so the OS releases the lock automatically if the process dies
+_db_lock_file = None
+
+
+def _try_lock_db_lock_file() -> bool:
+    """Attempt to acquire the advisory lock without blocking.
+
+    Returns:
+        bool: True if the lock was acquired, False if another process holds it.
+    """
+    global _db_lock_file
+    if _db_lock_file is None:
+        _db_lock_file = open(DATABASE_LOCK_FILE_PATH, "a+")
+    try:
+        if sys.platform == "win32":
+            import msvcrt
+
+            _db_lock_file.seek(0)
+            msvcrt.locking(_db_lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(_db_lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
 def acquire_db_lock(timeout: int = 60) -> bool:
-    """Check if the database is locked.
+    """Acquire an advisory lock on the database lock file.
+
+    Uses a kernel-mediated file lock on a persistently open file descriptor,
+    so stale locks vanish when their holder exits and waiters wake as soon as
+    the lock is released instead of polling on file existence.
 
     Args:
         timeout (int): The timeout in seconds. Defaults to 60.
@@ -931,38 +1223,42 @@ def acquire_db_lock(timeout: int = 60) -> bool:
         bool: True if acquired the lock, False otherwise.
     """
     start = time.time()
+    delay = 0.01
     while True:
         if timeout > 0 and time.time() - start > timeout:
             logger.error("Failed to acquire database lock.")
             return False
-        if os.path.exists(DATABASE_LOCK_FILE_PATH):
-            with open(DATABASE_LOCK_FILE_PATH, "r") as lock_file:
-                lock_info = json.load(lock_file)
-            # check if the process is still running
-            if psutil.pid_exists(lock_info["pid"]):
-                logger.info("Database is locked. Waiting...")
-                time.sleep(1)
-            else:
-                release_db_lock(raise_exception=False)
-        else:
-            with open(DATABASE_LOCK_FILE_PATH, "w") as lock_file:
-                lock_file.write(json.dumps({"pid": os.getpid(), "time": time.time()}))
-                logger.info("Database lock acquired.")
-            break
-    return True
+        if _try_lock_db_lock_file():
+            logger.info("Database lock acquired.")
+            return True
+        logger.info("Database is locked. Waiting...")
+        time.sleep(delay)
+        # exponential backoff, capped at 100ms
+        delay = min(delay * 2, 0.1)
 
 
 def release_db_lock(raise_exception: bool = True) -> None:
     """Release the database lock.
 
     Args:
-        raise_exception (bool): Whether to raise an exception if the lock file is
-        not found.
+        raise_exception (bool): Whether to raise an exception if the lock is
+        not held.
     """
     try:
-        os.remove(DATABASE_LOCK_FILE_PATH)
-    except FileNotFoundError:
+        if _db_lock_file is None:
+            raise ValueError("Database lock was never acquired.")
+        if sys.platform == "win32":
+            import msvcrt
+
+            _db_lock_file.seek(0)
+            msvcrt.locking(_db_lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(_db_lock_file.fileno(), fcntl.LOCK_UN)
+    except (OSError, ValueError) as exc:
         if raise_exception:
-            logger.error("Database lock file not found.")
+            logger.error("Failed to release database lock.")
             raise
+        logger.warning(exc)
     logger.info("Database lock released.")
@@ -53,6 +53,8 @@ def get_engine() -> sa.engine:
         config.DB_URL,
         connect_args={"check_same_thread": False},
         echo=config.DB_ECHO,
+        # batch bulk inserts into multi-row VALUES statements of this size
+        insertmanyvalues_page_size=1000,
     )
     return engine
 
@@ -75,6 +77,32 @@ engine = get_engine()
 Base = get_base()
 Session = sessionmaker(bind=engine)
 
+# PRAGMAs applied to every new SQLite connection; WAL + synchronous=NORMAL
+# avoids an fsync per commit while remaining crash-safe
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "mmap_size=268435456",
+    "cache_size=-65536",
+)
+
+
+@event.listens_for(engine, "connect")
+def set_sqlite_pragmas(
+    dbapi_connection: Any, connection_record: sa.pool.ConnectionPoolEntry
+) -> None:
+    """Configure SQLite for high-frequency recording writes.
+
+    Args:
+        dbapi_connection: The raw DBAPI connection.
+        connection_record: The connection pool record.
+    """
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
+
 
 def get_read_only_session_maker(_engine: Optional["engine"] = None) -> sessionmaker:
     """Create a read-only session maker.
@@ -167,13 +195,19 @@ def copy_recording_data(
                     src_select = table.select().where(
                         table.c.recording_id == recording_id
                     )
-                    src_rows = src_conn.execute(src_select).fetchall()
+                    src_result = src_conn.execute(src_select)
 
-                    # Insert data into target table
+                    # Stream data into the target table in batches to keep
+                    # peak memory bounded (screenshot blobs can be large)
                     tgt_table = tgt_metadata.tables[table.name]
-                    for row in src_rows:
-                        tgt_insert = tgt_table.insert().values(**row._asdict())
-                        tgt_conn.execute(tgt_insert)
+                    while True:
+                        src_rows = src_result.fetchmany(1000)
+                        if not src_rows:
+                            break
+                        tgt_conn.execute(
+                            tgt_table.insert(),
+                            [row._asdict() for row in src_rows],
+                        )
 
             # Copy data from alembic_version table
             src_alembic_version_table = src_metadata.tables["alembic_version"]
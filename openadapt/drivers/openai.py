@@ -6,9 +6,11 @@ https://platform.openai.com/docs/guides/vision
 from copy import deepcopy
 from pprint import pformat
 from typing import Any
+import hashlib
 
 from PIL import Image
 import fire
+import orjson
 import requests
 
 from openadapt import cache, utils
@@ -35,11 +37,15 @@ MAX_IMAGES = 90
 total_tokens_used = 0
 total_cost = 0.0
 
+# Reuse HTTPS connections (keep-alive) across API calls to avoid paying the
+# TCP + TLS handshake on every request
+_session = requests.Session()
+
 
 def create_payload(
     prompt: str,
     system_prompt: str | None = None,
-    images: list[Image.Image] | None = None,
+    images: list[Image.Image | str] | None = None,
     model: str = MODEL_NAME,
     detail: str = "high",  # "low" or "high"
     max_tokens: int | None = None,
@@ -49,7 +55,8 @@ def create_payload(
     Args:
         prompt: the prompt
         system_prompt: the system prompt
-        images: list of images
+        images: list of images; entries which are already base64 data URLs
+            (str) are embedded as-is without re-encoding
         model: name of OpenAI model
         detail: detail level of images, "low" or "high"
         max_tokens: maximum number of tokens
@@ -63,33 +70,33 @@ def create_payload(
         max_tokens = MAX_TOKENS
 
     """Creates the payload for the API request."""
+    # build the content list in a single pass rather than appending per image
+    user_content = [
+        {
+            "type": "text",
+            "text": prompt,
+        },
+    ] + [
+        {
+            "type": "image_url",
+            "image_url": {
+                "url": image if isinstance(image, str) else utils.image2utf8(image),
+                "detail": detail,
+            },
+        }
+        for image in images or []
+    ]
+
     messages = [
         {
             "role": "user",
-            "content": [
-                {
-                    "type": "text",
-                    "text": prompt,
-                },
-            ],
+            "content": user_content,
         },
     ]
 
-    images = images or []
-    for image in images:
-        base64_image = utils.image2utf8(image)
-        messages[0]["content"].append(
-            {
-                "type": "image_url",
-                "image_url": {
-                    "url": base64_image,
-                    "detail": detail,
-                },
-            }
-        )
-
     if system_prompt:
-        messages = [
+        messages.insert(
+            0,
             {
                 "role": "system",
                 "content": [
@@ -98,8 +105,8 @@ def create_payload(
                         "text": system_prompt,
                     }
                 ],
-            }
-        ] + messages
+            },
+        )
 
     rval = {
         "model": model,
@@ -110,13 +117,44 @@ def create_payload(
     return rval
 
 
-@cache.cache()
+# in-memory memo in front of the disk cache: repeated identical payloads
+# within a process resolve without a disk read + unpickle of a large response
+_response_memo: dict[bytes, dict] = {}
+_RESPONSE_MEMO_MAX_SIZE = 128
+
+
 def get_response(
     payload: dict,
     api_key: str = config.OPENAI_API_KEY,
 ) -> requests.Response:
     """Sends a request to the OpenAI API and returns the response.
 
+    Args:
+        payload: dictionary returned by create_payload
+        api_key (str): api key
+
+    Returns:
+        response from OpenAI API
+    """
+    memo_key = hashlib.sha256(orjson.dumps(payload) + api_key.encode()).digest()
+    if memo_key in _response_memo:
+        return _response_memo[memo_key]
+    result = _get_response(payload, api_key)
+    if len(_response_memo) >= _RESPONSE_MEMO_MAX_SIZE:
+        # evict the oldest entry (dicts preserve insertion order); the
+        # default keeps a concurrent eviction of the same key from raising
+        _response_memo.pop(next(iter(_response_memo)), None)
+    _response_memo[memo_key] = result
+    return result
+
+
+@cache.cache()
+def _get_response(
+    payload: dict,
+    api_key: str,
+) -> requests.Response:
+    """Sends a request to the OpenAI API, bypassing the in-memory memo.
+
     Args:
         payload: dictionary returned by create_payload
         api_key (str): api key
@@ -128,12 +166,14 @@ def get_response(
         "Content-Type": "application/json",
         "Authorization": f"Bearer {api_key}",
     }
-    response = requests.post(
+    # serialize with orjson instead of requests' internal json.dumps; the
+    # payload can contain megabytes of base64 image data
+    response = _session.post(
         "https://api.openai.com/v1/chat/completions",
         headers=headers,
-        json=payload,
+        data=orjson.dumps(payload),
     )
-    result = response.json()
+    result = orjson.loads(response.content)
     if "error" in result:
         error = result["error"]
         message = error["message"]
@@ -43,10 +43,9 @@ def get_events(
         event="get_events.started", properties={"recording_id": recording.id}
     )
     start_time = time.time()
-    action_events = crud.get_action_events(db, recording)
-    window_events = crud.get_window_events(db, recording)
-    browser_events = crud.get_browser_events(db, recording)
-    screenshots = crud.get_screenshots(db, recording)
+    action_events, window_events, browser_events, screenshots = crud.get_all_events(
+        db, recording
+    )
 
     browser_stats = browser.assign_browser_events(db, action_events, browser_events)
     browser.log_stats(browser_stats)
@@ -75,30 +75,40 @@ class Recording(db.Base):
         back_populates="recording",
         order_by="ActionEvent.timestamp",
         cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     screenshots = sa.orm.relationship(
         "Screenshot",
         back_populates="recording",
         order_by="Screenshot.timestamp",
         cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     window_events = sa.orm.relationship(
         "WindowEvent",
         back_populates="recording",
         order_by="WindowEvent.timestamp",
         cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     browser_events = sa.orm.relationship(
         "BrowserEvent",
         back_populates="recording",
         order_by="BrowserEvent.timestamp",
         cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     scrubbed_recordings = sa.orm.relationship(
-        "ScrubbedRecording", back_populates="recording", cascade="all, delete-orphan"
+        "ScrubbedRecording",
+        back_populates="recording",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     audio_info = sa.orm.relationship(
-        "AudioInfo", back_populates="recording", cascade="all, delete-orphan"
+        "AudioInfo",
+        back_populates="recording",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
     _processed_action_events = None
@@ -130,6 +140,9 @@ class ActionEvent(db.Base):
     """Class representing an action event in the database."""
 
     __tablename__ = "action_event"
+    __table_args__ = (
+        sa.Index("ix_action_event_recording_id_timestamp", "recording_id", "timestamp"),
+    )
     _repr_ignore_attrs = ["reducer_names"]
 
     _segment_description_separator = ";"
@@ -138,7 +151,7 @@ class ActionEvent(db.Base):
     name = sa.Column(sa.String)
     timestamp = sa.Column(ForceFloat)
     recording_timestamp = sa.Column(ForceFloat)
-    recording_id = sa.Column(sa.ForeignKey("recording.id"))
+    recording_id = sa.Column(sa.ForeignKey("recording.id", ondelete="CASCADE"))
     screenshot_timestamp = sa.Column(ForceFloat)
     screenshot_id = sa.Column(sa.ForeignKey("screenshot.id"))
     window_event_timestamp = sa.Column(ForceFloat)
@@ -630,10 +643,13 @@ class WindowEvent(db.Base):
     """Class representing a window event in the database."""
 
     __tablename__ = "window_event"
+    __table_args__ = (
+        sa.Index("ix_window_event_recording_id_timestamp", "recording_id", "timestamp"),
+    )
 
     id = sa.Column(sa.Integer, primary_key=True)
     recording_timestamp = sa.Column(ForceFloat)
-    recording_id = sa.Column(sa.ForeignKey("recording.id"))
+    recording_id = sa.Column(sa.ForeignKey("recording.id", ondelete="CASCADE"))
     timestamp = sa.Column(ForceFloat)
     state = sa.Column(sa.JSON)
     title = sa.Column(sa.String)
@@ -756,10 +772,15 @@ class BrowserEvent(db.Base):
     """Class representing a browser event in the database."""
 
     __tablename__ = "browser_event"
+    __table_args__ = (
+        sa.Index(
+            "ix_browser_event_recording_id_timestamp", "recording_id", "timestamp"
+        ),
+    )
 
     id = sa.Column(sa.Integer, primary_key=True)
     recording_timestamp = sa.Column(ForceFloat)
-    recording_id = sa.Column(sa.ForeignKey("recording.id"))
+    recording_id = sa.Column(sa.ForeignKey("recording.id", ondelete="CASCADE"))
     message = sa.Column(sa.JSON)
     timestamp = sa.Column(ForceFloat)
 
@@ -925,10 +946,13 @@ class Screenshot(db.Base):
     """Class representing a screenshot in the database."""
 
     __tablename__ = "screenshot"
+    __table_args__ = (
+        sa.Index("ix_screenshot_recording_id_timestamp", "recording_id", "timestamp"),
+    )
 
     id = sa.Column(sa.Integer, primary_key=True)
     recording_timestamp = sa.Column(ForceFloat)
-    recording_id = sa.Column(sa.ForeignKey("recording.id"))
+    recording_id = sa.Column(sa.ForeignKey("recording.id", ondelete="CASCADE"))
     timestamp = sa.Column(ForceFloat)
     png_data = sa.Column(sa.LargeBinary)
     png_diff_data = sa.Column(sa.LargeBinary, nullable=True)
@@ -1109,7 +1133,7 @@ class AudioInfo(db.Base):
     flac_data = sa.Column(sa.LargeBinary)
     transcribed_text = sa.Column(sa.String)
     recording_timestamp = sa.Column(ForceFloat)
-    recording_id = sa.Column(sa.ForeignKey("recording.id"))
+    recording_id = sa.Column(sa.ForeignKey("recording.id", ondelete="CASCADE"))
     sample_rate = sa.Column(sa.Integer)
     words_with_timestamps = sa.Column(sa.Text)
 
@@ -1120,10 +1144,17 @@ class PerformanceStat(db.Base):
     """Class representing a performance statistic in the database."""
 
     __tablename__ = "performance_stat"
+    __table_args__ = (
+        sa.Index(
+            "ix_performance_stat_recording_id_start_time",
+            "recording_id",
+            "start_time",
+        ),
+    )
 
     id = sa.Column(sa.Integer, primary_key=True)
     recording_timestamp = sa.Column(ForceFloat)
-    recording_id = sa.Column(sa.ForeignKey("recording.id"))
+    recording_id = sa.Column(sa.ForeignKey("recording.id", ondelete="CASCADE"))
     event_type = sa.Column(sa.String)
     start_time = sa.Column(sa.Integer)
     end_time = sa.Column(sa.Integer)
@@ -1134,10 +1165,13 @@ class MemoryStat(db.Base):
     """Class representing a memory usage statistic in the database."""
 
     __tablename__ = "memory_stat"
+    __table_args__ = (
+        sa.Index("ix_memory_stat_recording_id_timestamp", "recording_id", "timestamp"),
+    )
 
     id = sa.Column(sa.Integer, primary_key=True)
     recording_timestamp = sa.Column(sa.Integer)
-    recording_id = sa.Column(sa.ForeignKey("recording.id"))
+    recording_id = sa.Column(sa.ForeignKey("recording.id", ondelete="CASCADE"))
     memory_usage_bytes = sa.Column(ForceFloat)
     timestamp = sa.Column(ForceFloat)
 
@@ -1150,7 +1184,7 @@ class ScrubbedRecording(db.Base):
     id = sa.Column(sa.Integer, primary_key=True)
     timestamp = sa.Column(ForceFloat)
 
-    recording_id = sa.Column(sa.ForeignKey("recording.id"))
+    recording_id = sa.Column(sa.ForeignKey("recording.id", ondelete="CASCADE"))
     recording = sa.orm.relationship("Recording", back_populates="scrubbed_recordings")
 
     provider = sa.Column(sa.String)
@@ -3,12 +3,13 @@
 from collections import defaultdict
 from io import BytesIO
 from itertools import cycle
+import functools
 import math
 import os
 import sys
 import unicodedata
 
-from PIL import Image, ImageDraw, ImageEnhance, ImageFont
+from PIL import Image, ImageColor, ImageDraw, ImageEnhance, ImageFont
 import matplotlib.pyplot as plt
 import numpy as np
 
@@ -67,8 +68,9 @@ def draw_ellipse(
     return image, width, height
 
 
+@functools.lru_cache(maxsize=16)
 def get_font(original_font_name: str, font_size: int) -> ImageFont.FreeTypeFont:
-    """Get a font object.
+    """Get a font object. Cached, since loading a truetype font hits the disk.
 
     Args:
         original_font_name (str): The original font name.
@@ -518,26 +520,25 @@ def display_binary_images_grid(
     max_width = max(image.shape[1] for image in images) + margin
     max_height = max(image.shape[0] for image in images) + margin
 
-    # Create a new image with a white background
+    # Write each mask into one preallocated white canvas, then convert to a
+    # PIL image once, instead of allocating margin and mode-conversion
+    # buffers per cell
     total_width = max_width * grid_size[1] + margin
     total_height = max_height * grid_size[0] + margin
-    grid_image = Image.new("1", (total_width, total_height), 1)
+    grid = np.full((total_height, total_width), 255, dtype=np.uint8)
 
     for index, binary_image in enumerate(images):
-        # Convert ndarray to PIL Image
-        img = Image.fromarray(binary_image.astype(np.uint8) * 255, "L").convert("1")
-        img_with_margin = Image.new("1", (img.width + margin, img.height + margin), 1)
-        img_with_margin.paste(img, (margin // 2, margin // 2))
-
         # Calculate the position on the grid
         row, col = divmod(index, grid_size[1])
-        x = col * max_width + margin // 2
-        y = row * max_height + margin // 2
+        x = col * max_width + margin
+        y = row * max_height + margin
 
-        # Paste the image into the grid
-        grid_image.paste(img_with_margin, (x, y))
+        # Write the image into the grid
+        height, width = binary_image.shape
+        grid[y : y + height, x : x + width] = binary_image.astype(np.uint8) * 255
 
     # Display the grid image
+    grid_image = Image.fromarray(grid, "L").convert("1")
     grid_image.show()
 
 
@@ -566,7 +567,8 @@ def display_images_table_with_titles(
     max_image_width = max(image.width for image in images)
     total_height = sum(image.height for image in images) + margin * (len(images) - 1)
     max_title_height = fontsize + margin  # simple approach to calculating title height
-    max_title_width = max(font.getsize(title)[0] for title in titles) + margin
+    # getlength computes advance width only, skipping full glyph metrics
+    max_title_width = int(math.ceil(max(map(font.getlength, titles)))) + margin
 
     composite_image_width = max_image_width + max_title_width + margin * 3
     composite_image_height = max(
@@ -615,21 +617,15 @@ def create_striped_background(
     Returns:
         Image.Image: An image with diagonal stripes.
     """
-    image = Image.new("RGB", (width, height), "black")
-    draw = ImageDraw.Draw(image)
-    stripe_color = 0
-    for i in range(-height, width + height, stripe_width):
-        draw.polygon(
-            [
-                (i, 0),
-                (i + stripe_width, 0),
-                (i + height + stripe_width, height),
-                (i + height, height),
-            ],
-            fill=colors[stripe_color],
-        )
-        stripe_color = 1 - stripe_color  # Switch between 0 and 1 to alternate colors
-    return image
+    # generate the stripes with modulo arithmetic in one vectorized pass
+    # instead of rasterizing one polygon per stripe; each diagonal stripe is
+    # the set of pixels sharing a value of (x - y) // stripe_width
+    y, x = np.indices((height, width), dtype=np.int32)
+    band = ((x - y + height) // stripe_width) & 1
+    stripes = np.empty((height, width, 3), np.uint8)
+    stripes[band == 0] = ImageColor.getrgb(colors[0])
+    stripes[band == 1] = ImageColor.getrgb(colors[1])
+    return Image.fromarray(stripes)
 
 
 def plot_similar_image_groups(
@@ -10,7 +10,6 @@ from collections import namedtuple
 from functools import partial
 from typing import Any, Callable
 import io
-import json
 import multiprocessing
 import os
 import queue
@@ -34,6 +33,7 @@ with redirect_stdout_stderr():
     import fire
 
 import numpy as np
+import orjson
 import psutil
 import soundfile
 import websockets.sync.server
@@ -441,6 +441,9 @@ def write_events(
                 progress.update()
         logger.debug(f"{event_type=} written")
 
+    # write out any events still sitting in the insert buffers
+    crud.flush_buffers(session)
+
     if post_callback:
         post_callback(state)
 
@@ -826,6 +829,7 @@ def performance_stats_writer(
             start_time,
             end_time,
         )
+    crud.flush_buffers(session)
     logger.info("Performance stats writer done")
 
 
@@ -882,6 +886,7 @@ def memory_writer(
             rss,
             timestamp,
         )
+    crud.flush_buffers(session)
     logger.info("Memory writer done")
 
 
@@ -1196,15 +1201,23 @@ def read_browser_events(
             message = websocket.recv(0.01)
         except TimeoutError:
             continue
-        timestamp = utils.get_timestamp()
-        data = json.loads(message)
-        event_q.put(
-            Event(
-                timestamp,
-                "browser",
-                {"message": data},
+        while True:
+            timestamp = utils.get_timestamp()
+            data = orjson.loads(message)
+            event_q.put(
+                Event(
+                    timestamp,
+                    "browser",
+                    {"message": data},
+                )
             )
-        )
+            # drain any messages the websocket has already buffered before
+            # waiting on the poll timeout again, so bursts of browser events
+            # are processed back-to-back
+            try:
+                message = websocket.recv(timeout=0)
+            except TimeoutError:
+                break
 
     set_browser_mode("idle", websocket)
 
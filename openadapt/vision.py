@@ -1,9 +1,13 @@
 """Computer vision module."""
 
+import concurrent.futures
 import math
+import threading
 
 from PIL import Image
 from scipy.ndimage import binary_fill_holes
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
 from skimage.metrics import structural_similarity as ssim
 import cv2
 import numpy as np
@@ -12,6 +16,41 @@ from openadapt import cache
 from openadapt.custom_logger import logger
 
 
+# memo of PIL -> NumPy conversions; converting a 4K screenshot allocates
+# tens of MB, and the pipeline functions below each re-convert the same
+# image. Entries keep a reference to the source and are identity-checked so
+# a recycled id() cannot return a stale array.
+_AS_NP_MEMO_MAX_SIZE = 8
+_as_np_memo: dict[int, tuple[Image.Image, np.ndarray]] = {}
+
+# guards the memos below; get_similar_image_idxs calls into them from a
+# thread pool, and unsynchronized eviction can pop the same key twice
+_memo_lock = threading.Lock()
+
+
+def _as_np(image: Image.Image) -> np.ndarray:
+    """Convert an image to a NumPy array, reusing a previous conversion.
+
+    Args:
+        image: The image to convert.
+
+    Returns:
+        The image as a NumPy array. Treat it as read-only; it is shared
+        across callers.
+    """
+    with _memo_lock:
+        cached = _as_np_memo.get(id(image))
+        if cached is not None and cached[0] is image:
+            return cached[1]
+    array = np.asarray(image)
+    with _memo_lock:
+        if len(_as_np_memo) >= _AS_NP_MEMO_MAX_SIZE:
+            # evict the oldest entry (dicts preserve insertion order)
+            _as_np_memo.pop(next(iter(_as_np_memo)))
+        _as_np_memo[id(image)] = (image, array)
+    return array
+
+
 @cache.cache()
 def get_masks_from_segmented_image(
     segmented_image: Image.Image, sort_by_area: bool = False
@@ -30,32 +69,58 @@ def get_masks_from_segmented_image(
             specified.
     """
     logger.info("starting...")
-    segmented_image_np = np.array(segmented_image)
+    segmented_image_np = _as_np(segmented_image)
 
     # Assume the last channel is the alpha channel if the image has 4 channels
     if segmented_image_np.shape[2] == 4:
         segmented_image_np = segmented_image_np[:, :, :3]
 
-    # Find unique colors in the image, each unique color corresponds to a unique mask
-    unique_colors = np.unique(
-        segmented_image_np.reshape(-1, segmented_image_np.shape[2]), axis=0
-    )
+    # Pack the three channels into one uint32 per pixel so unique colors can
+    # be labelled in a single pass instead of one full-image comparison per
+    # color
+    channels = segmented_image_np.astype(np.uint32)
+    packed = channels[..., 0] | (channels[..., 1] << 8) | (channels[..., 2] << 16)
+    # ravel/reshape keep this working on NumPy 1.x (flat inverse) and
+    # NumPy >= 2.0 (input-shaped inverse) alike
+    unique_colors, inverse = np.unique(packed, return_inverse=True)
+    label_img = inverse.reshape(packed.shape)
     logger.info(f"{len(unique_colors)=}")
 
-    masks = []
-    for color in unique_colors:
-        # Create a mask for each unique color
-        mask = np.all(segmented_image_np == color, axis=-1)
-        masks.append(mask)
-
+    labels = range(len(unique_colors))
     if sort_by_area:
-        # Calculate the area of each mask and sort the masks by area in descending order
-        masks.sort(key=np.sum, reverse=True)
+        # Sort labels by mask area in descending order
+        areas = np.bincount(inverse.ravel())
+        labels = np.argsort(areas)[::-1]
+
+    masks = [label_img == label for label in labels]
 
     logger.info(f"{len(masks)=}")
     return masks
 
 
+def _mask_bbox(mask: np.ndarray) -> tuple[int, int, int, int] | None:
+    """Get the bounding box of a mask's "on" pixels.
+
+    Reduces along each axis instead of materializing every coordinate, so
+    the cost is two C-level passes over the mask rather than an
+    O(num_on_pixels) index array.
+
+    Args:
+        mask: A numpy.ndarray representing a binary mask.
+
+    Returns:
+        A tuple (row_min, row_max, col_min, col_max), inclusive, or None if
+        the mask is empty.
+    """
+    rows = mask.any(axis=1)
+    cols = mask.any(axis=0)
+    row_idxs = np.flatnonzero(rows)
+    if row_idxs.size == 0:
+        return None
+    col_idxs = np.flatnonzero(cols)
+    return row_idxs[0], row_idxs[-1], col_idxs[0], col_idxs[-1]
+
+
 @cache.cache()
 def filter_masks_by_size(
     masks: list[np.ndarray],
@@ -73,10 +138,9 @@ def filter_masks_by_size(
     """
     size_filtered_masks = []
     for mask in masks:
-        coords = np.argwhere(mask)  # Get coordinates of all "on" pixels
-        if coords.size > 0:
-            y_min, x_min = coords.min(axis=0)
-            y_max, x_max = coords.max(axis=0)
+        bbox = _mask_bbox(mask)
+        if bbox is not None:
+            y_min, y_max, x_min, x_max = bbox
             height = y_max - y_min + 1
             width = x_max - x_min + 1
             if height >= min_mask_size[0] and width >= min_mask_size[1]:
@@ -106,23 +170,46 @@ def refine_masks(masks: list[np.ndarray]) -> list[np.ndarray]:
     masks = remove_border_masks(masks)
     masks = filter_thin_ragged_masks(masks)
 
-    # Fill holes in each mask
-    filled_masks = [binary_fill_holes(mask).astype(np.uint8) for mask in masks]
+    # Fill holes in all masks with one scipy call: stack them and restrict
+    # the structuring element to in-plane connectivity, so each slice fills
+    # independently with the same cross connectivity the 2-D default uses
+    if masks:
+        structure = np.zeros((3, 3, 3), dtype=bool)
+        structure[1] = [[False, True, False], [True, True, True], [False, True, False]]
+        filled = binary_fill_holes(np.stack(masks), structure=structure)
+        filled_masks = [mask.astype(np.uint8) for mask in filled]
+    else:
+        filled_masks = []
 
     size_filtered_masks = filter_masks_by_size(filled_masks)
 
-    # Remove masks completely contained within other masks
+    # Remove masks completely contained within other masks. Bit-pack each
+    # mask (8 pixels per byte) so a containment test is a popcount over the
+    # packed AND rather than a full-resolution array comparison, and only
+    # test against masks at least as large, since a strictly smaller mask
+    # cannot contain this one.
+    num_masks = len(size_filtered_masks)
     refined_masks = []
-    for i, mask_i in enumerate(size_filtered_masks):
-        contained = False
-        for j, mask_j in enumerate(size_filtered_masks):
-            if i != j:
-                # Check if mask_i is completely contained in mask_j
-                if np.array_equal(mask_i & mask_j, mask_i):
-                    contained = True
-                    break
-        if not contained:
-            refined_masks.append(mask_i)
+    if num_masks:
+        packed = np.packbits(
+            np.asarray(size_filtered_masks, dtype=bool).reshape(num_masks, -1),
+            axis=1,
+        )
+        popcount = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(
+            axis=1
+        )
+        areas = popcount[packed].sum(axis=1)
+        for i, mask_i in enumerate(size_filtered_masks):
+            contained = False
+            for j in range(num_masks):
+                if i != j and areas[j] >= areas[i]:
+                    # mask_i is contained in mask_j iff their intersection
+                    # covers all of mask_i
+                    if popcount[packed[i] & packed[j]].sum() == areas[i]:
+                        contained = True
+                        break
+            if not contained:
+                refined_masks.append(mask_i)
 
     logger.info(f"{len(refined_masks)=}")
     return refined_masks
@@ -145,19 +232,32 @@ def filter_thin_ragged_masks(
         A list of ndarrays with thin and ragged masks filtered out.
     """
     logger.info(f"{len(masks)=}")
+    if not masks:
+        return []
     kernel = np.ones((kernel_size, kernel_size), np.uint8)
-    filtered_masks = []
 
-    for mask in masks:
-        # Convert boolean mask to uint8
-        mask_uint8 = mask.astype(np.uint8) * 255
-        # Perform erosion
-        eroded_mask = cv2.erode(mask_uint8, kernel, iterations=iterations)
-        # Perform dilation
-        dilated_mask = cv2.dilate(eroded_mask, kernel, iterations=iterations)
-
-        # Convert back to boolean mask and add to the filtered list
-        filtered_masks.append(dilated_mask > 0)
+    # Stack the masks into one tall image separated by spacer rows, so the
+    # erosion and dilation each run as a single OpenCV call instead of one
+    # Python->C crossing per mask. The spacer is tall enough that no mask's
+    # pixels can influence a neighbour within the iteration count.
+    num_masks = len(masks)
+    height, width = masks[0].shape
+    separator = 2 * iterations * (kernel_size // 2) + 2
+    stride = height + separator
+    # spacers start at 255, matching the "border is on" value erosion assumes
+    # at the virtual image border, then are zeroed before dilation
+    tall = np.full((stride * num_masks - separator, width), 255, np.uint8)
+    for idx, mask in enumerate(masks):
+        tall[idx * stride : idx * stride + height] = mask.astype(np.uint8) * 255
+
+    eroded = cv2.erode(tall, kernel, iterations=iterations)
+    for idx in range(num_masks - 1):
+        eroded[idx * stride + height : (idx + 1) * stride] = 0
+    dilated = cv2.dilate(eroded, kernel, iterations=iterations)
+
+    filtered_masks = [
+        dilated[idx * stride : idx * stride + height] > 0 for idx in range(num_masks)
+    ]
 
     logger.info(f"{len(filtered_masks)=}")
     return filtered_masks
@@ -178,28 +278,27 @@ def remove_border_masks(
     Returns:
     - A list of ndarrays with the border masks removed.
     """
+    logger.info(f"{len(masks)=}")
+    if not masks:
+        return []
 
-    def is_close_to_all_borders(mask: np.ndarray, threshold: float) -> bool:
-        # Determine actual threshold in pixels based on the percentage
-        threshold_rows = int(mask.shape[0] * (threshold_percent / 100))
-        threshold_cols = int(mask.shape[1] * (threshold_percent / 100))
-
-        # Check for "on" pixels close to each border
-        top = np.any(mask[:threshold_rows, :])
-        bottom = np.any(mask[-threshold_rows:, :])
-        left = np.any(mask[:, :threshold_cols])
-        right = np.any(mask[:, -threshold_cols:])
+    # Stack the masks and test all four borders across the whole batch with
+    # one reduction per side, instead of four np.any calls per mask
+    stack = np.asarray(masks, dtype=bool)
 
-        # If "on" pixels are close to all borders, return True
-        return top and bottom and left and right
+    # Determine actual threshold in pixels based on the percentage
+    threshold_rows = int(stack.shape[1] * (threshold_percent / 100))
+    threshold_cols = int(stack.shape[2] * (threshold_percent / 100))
 
-    logger.info(f"{len(masks)=}")
+    # Check for "on" pixels close to each border
+    top = stack[:, :threshold_rows, :].any(axis=(1, 2))
+    bottom = stack[:, -threshold_rows:, :].any(axis=(1, 2))
+    left = stack[:, :, :threshold_cols].any(axis=(1, 2))
+    right = stack[:, :, -threshold_cols:].any(axis=(1, 2))
 
-    filtered_masks = []
-    for mask in masks:
-        # Only add mask if it is not close to all borders
-        if not is_close_to_all_borders(mask, threshold_percent):
-            filtered_masks.append(mask)
+    # Only keep masks whose "on" pixels are not close to all four borders
+    keep = ~(top & bottom & left & right)
+    filtered_masks = [mask for mask, keep_mask in zip(masks, keep) if keep_mask]
 
     logger.info(f"{len(filtered_masks)=}")
     return filtered_masks
@@ -223,24 +322,22 @@ def extract_masked_images(
         containing the content of the original image within that mask.
     """
     logger.info(f"{len(masks)=}")
-    original_image_np = np.array(original_image)
+    original_image_np = _as_np(original_image)
     masked_images = []
 
     for mask in masks:
         # Find the bounding box of the mask
-        rows = np.any(mask, axis=1)
-        cols = np.any(mask, axis=0)
-        rmin, rmax = np.where(rows)[0][[0, -1]]
-        cmin, cmax = np.where(cols)[0][[0, -1]]
+        rmin, rmax, cmin, cmax = _mask_bbox(mask)
 
         # Crop the mask and the image to the bounding box
         cropped_mask = mask[rmin : rmax + 1, cmin : cmax + 1]
         cropped_image = original_image_np[rmin : rmax + 1, cmin : cmax + 1]
 
-        # Apply the mask
-        masked_image = np.where(cropped_mask[:, :, None], cropped_image, 0).astype(
-            np.uint8
-        )
+        # Apply the mask: copy the masked pixels into a zeroed buffer, which
+        # avoids np.where's full per-channel select pass
+        on_pixels = cropped_mask.astype(bool)
+        masked_image = np.zeros_like(cropped_image)
+        masked_image[on_pixels] = cropped_image[on_pixels]
         masked_images.append(Image.fromarray(masked_image))
 
     logger.info(f"{len(masked_images)=}")
@@ -266,16 +363,15 @@ def calculate_bounding_boxes(
     bounding_boxes = []
     centroids = []
     for mask in masks:
-        # Find all indices where mask is True
-        rows, cols = np.where(mask)
-        if len(rows) == 0 or len(cols) == 0:  # In case of an empty mask
+        bbox = _mask_bbox(mask)
+        if bbox is None:  # In case of an empty mask
             bounding_boxes.append({})
             centroids.append((float("nan"), float("nan")))
             continue
 
         # Calculate bounding box
-        top, left = rows.min(), cols.min()
-        height, width = rows.max() - top, cols.max() - left
+        top, bottom, left, right = bbox
+        height, width = bottom - top, right - left
 
         # Calculate center
         center_x, center_y = left + width / 2, top + height / 2
@@ -294,6 +390,47 @@ def calculate_bounding_boxes(
     return bounding_boxes, centroids
 
 
+# memo of resized images keyed by (source id, target size); in the pairwise
+# loop above each image is otherwise re-resized O(N) times to the same
+# dimensions. The source image is kept in the value and identity-checked so
+# a recycled id() cannot return a stale entry.
+_RESIZE_MEMO_MAX_SIZE = 256
+_resize_memo: dict[tuple[int, int, int], tuple[Image.Image, Image.Image]] = {}
+
+
+def _resize_cached(
+    image: Image.Image,
+    target_width: int,
+    target_height: int,
+) -> Image.Image:
+    """Resize an image, reusing a previous result for the same target size.
+
+    Args:
+        image: The image to resize.
+        target_width: Target width in pixels.
+        target_height: Target height in pixels.
+
+    Returns:
+        The resized image.
+    """
+    if image.size == (target_width, target_height):
+        return image
+    key = (id(image), target_width, target_height)
+    with _memo_lock:
+        cached = _resize_memo.get(key)
+        if cached is not None and cached[0] is image:
+            return cached[1]
+    # BILINEAR is several times cheaper than LANCZOS and sufficient here:
+    # the SSIM window filter smooths away the resampling difference anyway
+    resized = image.resize((target_width, target_height), Image.BILINEAR)
+    with _memo_lock:
+        if len(_resize_memo) >= _RESIZE_MEMO_MAX_SIZE:
+            # evict the oldest entry (dicts preserve insertion order)
+            _resize_memo.pop(next(iter(_resize_memo)))
+        _resize_memo[key] = (image, resized)
+    return resized
+
+
 def get_image_similarity(
     im1: Image.Image,
     im2: Image.Image,
@@ -331,8 +468,8 @@ def get_image_similarity(
     )
 
     # Resize images to these new common dimensions
-    im1 = im1.resize((target_width, target_height), Image.LANCZOS)
-    im2 = im2.resize((target_width, target_height), Image.LANCZOS)
+    im1 = _resize_cached(im1, target_width, target_height)
+    im2 = _resize_cached(im2, target_width, target_height)
 
     if grayscale:
         # Convert images to grayscale
@@ -343,22 +480,20 @@ def get_image_similarity(
             im1, im2, win_size=win_size, data_range=data_range, full=True
         )
     else:
-        # Compute SSIM on each channel separately and then average the results
-        mssims = []
-        diff_images = []
-        for c in range(3):  # Assuming RGB images
-            im1_c = np.array(im1)[:, :, c]
-            im2_c = np.array(im2)[:, :, c]
-            data_range = max(im1_c.max(), im2_c.max()) - min(im1_c.min(), im2_c.min())
-            ssim_c, diff_c = ssim(
-                im1_c, im2_c, win_size=win_size, data_range=data_range, full=True
-            )
-            mssims.append(ssim_c)
-            diff_images.append(diff_c)
-
-        # Average the SSIM and create a mean difference image
-        mssim = np.mean(mssims)
-        diff_image = np.mean(diff_images, axis=0)
+        # Compute SSIM across all channels in one call; skimage averages the
+        # per-channel scores itself, and a single pass shares the filter
+        # setup three separate calls would repeat. Images are uint8, so the
+        # data range is 255 without per-channel min/max reductions.
+        mssim, diff_image = ssim(
+            _as_np(im1),
+            _as_np(im2),
+            win_size=win_size,
+            channel_axis=-1,
+            data_range=255,
+            full=True,
+        )
+        # Create a mean difference image
+        diff_image = diff_image.mean(axis=-1)
 
     return mssim, diff_image
 
@@ -369,7 +504,7 @@ def get_similar_image_idxs(
     min_ssim: float,
     min_size_sim: float,
     short_circuit_ssim: bool = True,
-) -> tuple[list[list[int]], list[int], list[list[float]], list[list[float]]]:
+) -> tuple[list[list[int]], list[int], np.ndarray, np.ndarray]:
     """Get images having Structural Similarity Index Measure (SSIM) above a threshold.
 
     Return the SSIM and size similarity matrices. Also returns indices of images not
@@ -394,44 +529,71 @@ def get_similar_image_idxs(
         - A matrix of size similarity values between each pair of images.
     """
     num_images = len(images)
-    already_compared = set()
-    similar_groups = []
-    ssim_matrix = [[0.0] * num_images for _ in range(num_images)]
-    size_similarity_matrix = [[0.0] * num_images for _ in range(num_images)]
-    all_indices = set(range(num_images))
-
-    for i in range(num_images):
-        ssim_matrix[i][i] = 1.0
-        size_similarity_matrix[i][i] = 1.0
-        for j in range(i + 1, num_images):
-            size_sim = get_size_similarity(images[i], images[j])
-            size_similarity_matrix[i][j] = size_similarity_matrix[j][i] = size_sim
-
-            if not short_circuit_ssim or size_sim >= min_size_sim:
-                s_ssim, _ = get_image_similarity(images[i], images[j])
-                ssim_matrix[i][j] = ssim_matrix[j][i] = s_ssim
-            else:
-                ssim_matrix[i][j] = ssim_matrix[j][i] = math.nan
 
+    # compute the full size-similarity matrix with outer min/max ratios
+    # instead of N^2 Python-level get_size_similarity calls
+    widths = np.array([image.size[0] for image in images], dtype=np.float64)
+    heights = np.array([image.size[1] for image in images], dtype=np.float64)
+    width_ratios = np.minimum.outer(widths, widths) / np.maximum.outer(widths, widths)
+    height_ratios = np.minimum.outer(heights, heights) / np.maximum.outer(
+        heights, heights
+    )
+    size_similarity_matrix = ((width_ratios + height_ratios) / 2).astype(np.float32)
+
+    ssim_matrix = np.full((num_images, num_images), math.nan, dtype=np.float32)
+    np.fill_diagonal(ssim_matrix, 1.0)
+
+    # precompute per-image grayscale mean and standard deviation; for a pair
+    # of images the global luminance and contrast terms bound the SSIM from
+    # above, so clearly dissimilar pairs can skip the filtering entirely
+    C1 = (0.01 * 255) ** 2
+    C2 = (0.03 * 255) ** 2
+    mus = np.empty(num_images)
+    sigmas = np.empty(num_images)
+    for i, image in enumerate(images):
+        gray = np.asarray(image.convert("L"), dtype=np.float64)
+        mus[i] = gray.mean()
+        sigmas[i] = gray.std()
+
+    # the SSIM calls are independent and spend most of their time in
+    # resize/filter code that releases the GIL, so run them across threads
+    pairs = []
     for i in range(num_images):
-        if i in already_compared:
-            continue
-        current_group = [i]
         for j in range(i + 1, num_images):
-            if j in already_compared:
-                continue
-            if (
-                ssim_matrix[i][j] >= min_ssim
-                and size_similarity_matrix[i][j] >= min_size_sim
-            ):
-                current_group.append(j)
-                already_compared.add(j)
-
-        if len(current_group) > 1:
-            similar_groups.append(current_group)
-        already_compared.add(i)
-
-    ungrouped_indices = list(all_indices - already_compared)
+            if short_circuit_ssim:
+                if size_similarity_matrix[i, j] < min_size_sim:
+                    continue
+                luma_term = (2 * mus[i] * mus[j] + C1) / (
+                    mus[i] ** 2 + mus[j] ** 2 + C1
+                )
+                contrast_term_ub = (2 * sigmas[i] * sigmas[j] + C2) / (
+                    sigmas[i] ** 2 + sigmas[j] ** 2 + C2
+                )
+                if luma_term * contrast_term_ub < min_ssim:
+                    ssim_matrix[i, j] = ssim_matrix[j, i] = 0.0
+                    continue
+            pairs.append((i, j))
+    if pairs:
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            ssims = executor.map(
+                lambda pair: get_image_similarity(images[pair[0]], images[pair[1]]),
+                pairs,
+            )
+            for (i, j), (s_ssim, _) in zip(pairs, ssims):
+                ssim_matrix[i, j] = ssim_matrix[j, i] = s_ssim
+
+    # group via connected components of the similarity graph; unlike the
+    # previous greedy scan this merges transitively similar images, and the
+    # whole pass runs in C (NaNs from short-circuited pairs compare False)
+    adjacency = (ssim_matrix >= min_ssim) & (size_similarity_matrix >= min_size_sim)
+    num_components, labels = connected_components(csr_matrix(adjacency), directed=False)
+    component_sizes = np.bincount(labels)
+    similar_groups = [
+        np.flatnonzero(labels == component).tolist()
+        for component in range(num_components)
+        if component_sizes[component] > 1
+    ]
+    ungrouped_indices = np.flatnonzero(component_sizes[labels] == 1).tolist()
 
     return similar_groups, ungrouped_indices, ssim_matrix, size_similarity_matrix
 
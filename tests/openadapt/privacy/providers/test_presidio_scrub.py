@@ -38,9 +38,8 @@ def _hex_to_rgb(hex_color: int) -> tuple[int, int, int]:
         tuple[int, int, int]: RGB values.
     """
     assert 0x000000 <= hex_color <= 0xFFFFFF
-    blue = (hex_color >> 16) & 0xFF
-    green = (hex_color >> 8) & 0xFF
-    red = hex_color & 0xFF
+    # little-endian keeps red in the low byte and blue in the high byte
+    red, green, blue = hex_color.to_bytes(3, "little")
     return red, green, blue
 
 
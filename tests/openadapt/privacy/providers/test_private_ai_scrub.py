@@ -6,30 +6,30 @@ import os
 
 from PIL import Image
 import easyocr
+import pytest
 import requests
 
 from openadapt.config import config
 from openadapt.custom_logger import logger
 from openadapt.privacy.providers.private_ai import PrivateAIScrubbingProvider
 
-scrub = PrivateAIScrubbingProvider()
-
-try:
-    scrub.scrub_text("hello Bob smith")
-except (ValueError, requests.exceptions.HTTPError):
-    import pytest
-
-    pytestmark = pytest.mark.skip(
-        reason="Private AI API key not found or invalid usage."
-    )
-
-
 URL = "https://api.private-ai.com/deid/v3/process/files/base64"
 CONTENT_TYPE = "application/pdf"
 TEST_PDF_PATH = "tests/assets/sample_llc_1.pdf"
 
 
-def test_pdf_redaction() -> None:
+@pytest.fixture(scope="session")
+def scrub() -> PrivateAIScrubbingProvider:
+    """Construct the provider lazily so collection never hits the network."""
+    provider = PrivateAIScrubbingProvider()
+    try:
+        provider.scrub_text("hello Bob smith")
+    except (ValueError, requests.exceptions.HTTPError):
+        pytest.skip("Private AI API key not found or invalid usage.")
+    return provider
+
+
+def test_pdf_redaction(scrub: PrivateAIScrubbingProvider) -> None:
     """Test to check that the PDF redaction works."""
     redacted_pdf_path = scrub.scrub_pdf(TEST_PDF_PATH)
 
@@ -59,7 +59,7 @@ def test_pdf_redaction() -> None:
     assert response.get("entities_present") is False
 
 
-def test_image_redaction() -> None:
+def test_image_redaction(scrub: PrivateAIScrubbingProvider) -> None:
     """Test to check that the image redaction works."""
     image_path = "tests/assets/test_image_redaction_privateai.png"
 
@@ -102,128 +102,74 @@ def test_image_redaction() -> None:
     assert redact_text == extract_redacted_text
 
 
-def test_empty_string() -> None:
-    """Test empty string input for scrub function returns empty string."""
-    text = ""
-    expected_output = ""
-    assert scrub.scrub_text(text) == expected_output
-
-
-def test_no_scrub_string() -> None:
-    """Test that the same string is returned."""
-    text = "This string doesn't have anything to scrub."
-    expected_output = "This string doesn't have anything to scrub."
-    assert scrub.scrub_text(text) == expected_output
-
-
-def test_scrub_email() -> None:
-    """Test that the email address is scrubbed."""
-    assert (
-        scrub.scrub_text("My email is john.doe@example.com.")
-        == "My email is [EMAIL_ADDRESS_1]."
-    )
-
-
-def test_scrub_phone_number() -> None:
-    """Test that the phone number is scrubbed."""
-    assert (
-        scrub.scrub_text("My phone number is 123-456-7890.")
-        == "My phone number is [PHONE_NUMBER_1]."
-    )
-
-
-def test_scrub_credit_card() -> None:
-    """Test that the credit card number is scrubbed."""
-    assert (
-        scrub.scrub_text("My credit card number is 4234-5678-9012-3456 and ")
-    ) == "My credit card number is [CREDIT_CARD_1] and "
-
-
-def test_scrub_date_of_birth() -> None:
-    """Test that the date of birth is scrubbed."""
-    assert (
-        scrub.scrub_text("My date of birth is 01/01/2000.")
-        == "My date of birth is [DOB_1]."
-    )
-
-
-def test_scrub_address() -> None:
-    """Test that the address is scrubbed."""
-    assert (
-        scrub.scrub_text("My address is 123 Main St, Toronto, On, CAN.")
-        == "My address is [LOCATION_ADDRESS_1]."
-    )
-
-
-def test_scrub_ssn() -> None:
-    """Test that the social security number is scrubbed."""
-    # Test scrubbing of social security number
-    assert (
-        scrub.scrub_text("My social security number is 923-45-6789")
-        == "My social security number is [SSN_1]"
-    )
-
-
-def test_scrub_dl() -> None:
-    """Test that the driver's license number is scrubbed."""
-    assert (
-        scrub.scrub_text("My driver's license number is A123-456-789-012")
-        == "My driver's license number is [DRIVER_LICENSE_1]"
-    )
-
-
-def test_scrub_passport() -> None:
-    """Test that the passport number is scrubbed."""
-    assert (
-        scrub.scrub_text("My passport number is A1234567.")
-        == "My passport number is [PASSPORT_NUMBER_1]."
-    )
-
-
-def test_scrub_national_id() -> None:
-    """Test that the national ID number is scrubbed."""
-    assert (
-        scrub.scrub_text("My national ID number is 1234567890123.")
-        == "My national ID number is [HEALTHCARE_NUMBER_1]."
-    )
-
-
-def test_scrub_routing_number() -> None:
-    """Test that the bank routing number is scrubbed."""
-    assert (
-        scrub.scrub_text("My bank routing number is 123456789.")
-        == "My bank routing number is [ROUTING_NUMBER_1]."
-    )
-
-
-def test_scrub_bank_account() -> None:
-    """Test that the bank account number is scrubbed."""
-    assert (
-        scrub.scrub_text("My bank account number is 635526789012.")
-        == "My bank account number is [BANK_ACCOUNT_1]."
-    )
-
-
-def test_scrub_all_together() -> None:
-    """Test that all PII/PHI types are scrubbed."""
-    text_with_pii_phi = (
+# (input, expected) pairs scrubbed in one batched API call; see scrubbed_texts
+SCRUB_TEXT_CASES = [
+    ("", ""),
+    (
+        "This string doesn't have anything to scrub.",
+        "This string doesn't have anything to scrub.",
+    ),
+    ("My email is john.doe@example.com.", "My email is [EMAIL_ADDRESS_1]."),
+    ("My phone number is 123-456-7890.", "My phone number is [PHONE_NUMBER_1]."),
+    (
+        "My credit card number is 4234-5678-9012-3456 and ",
+        "My credit card number is [CREDIT_CARD_1] and ",
+    ),
+    ("My date of birth is 01/01/2000.", "My date of birth is [DOB_1]."),
+    (
+        "My address is 123 Main St, Toronto, On, CAN.",
+        "My address is [LOCATION_ADDRESS_1].",
+    ),
+    (
+        "My social security number is 923-45-6789",
+        "My social security number is [SSN_1]",
+    ),
+    (
+        "My driver's license number is A123-456-789-012",
+        "My driver's license number is [DRIVER_LICENSE_1]",
+    ),
+    ("My passport number is A1234567.", "My passport number is [PASSPORT_NUMBER_1]."),
+    (
+        "My national ID number is 1234567890123.",
+        "My national ID number is [HEALTHCARE_NUMBER_1].",
+    ),
+    (
+        "My bank routing number is 123456789.",
+        "My bank routing number is [ROUTING_NUMBER_1].",
+    ),
+    (
+        "My bank account number is 635526789012.",
+        "My bank account number is [BANK_ACCOUNT_1].",
+    ),
+    (
         "John Smith's email is johnsmith@example.com and"
         " his phone number is 555-123-4567."
         "His credit card number is 4831-5538-2996-5651 and"
         " his social security number is 923-45-6789."
-        " He was born on 01/01/1980."
-    )
-    assert (
-        scrub.scrub_text(text_with_pii_phi)
-        == "[NAME_1]'s email is [EMAIL_ADDRESS_1] and"
+        " He was born on 01/01/1980.",
+        "[NAME_1]'s email is [EMAIL_ADDRESS_1] and"
         " his phone number is [PHONE_NUMBER_1].His"
         " credit card number is [CREDIT_CARD_1] and"
         " his social security number is [SSN_1]."
-        " He was born on [DOB_1]."
-    )
+        " He was born on [DOB_1].",
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def scrubbed_texts(scrub: PrivateAIScrubbingProvider) -> dict[str, str]:
+    """Scrub every case input in a single batched API call."""
+    texts = [text for text, _ in SCRUB_TEXT_CASES]
+    return dict(zip(texts, scrub.scrub_texts(texts)))
+
+
+@pytest.mark.parametrize("text,expected", SCRUB_TEXT_CASES)
+def test_scrub_text(text: str, expected: str, scrubbed_texts: dict[str, str]) -> None:
+    """Test that each PII/PHI type is scrubbed as expected."""
+    assert scrubbed_texts[text] == expected
 
 
-def test_scrub_dict() -> None:
+def test_scrub_dict(scrub: PrivateAIScrubbingProvider) -> None:
     """Test that the scrub_dict function works."""
     text_with_pii_phi = {"title": "hi my name is Bob Smith."}
 